@@ -0,0 +1,300 @@
+# Batched offline attendance sync for the mobile client
+# Add this view to your Django views.py and the URL to urls.py
+
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from datetime import timedelta
+from .location_policy import check_location, parse_coordinates
+from .shift_engine import (
+    ScheduleCache,
+    resolve_shift_date,
+    night_shift_still_open,
+    compute_shift_metrics,
+    apply_shift_metrics,
+)
+
+# Maximum number of queued events accepted in one request
+MAX_SYNC_EVENTS = 200
+
+# Events older than this are rejected instead of rewriting old records
+MAX_EVENT_AGE = timedelta(days=3)
+
+# Allowed clock skew for client timestamps in the future
+MAX_CLOCK_SKEW = timedelta(minutes=5)
+
+# Attendance.check_in_device / check_out_device max_length
+MAX_DEVICE_LENGTH = 20
+
+
+# Expected model (adjust names to match your project):
+"""
+class AttendanceSyncEvent(models.Model):
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE)
+    idempotency_key = models.CharField(max_length=64)
+    event_type = models.CharField(max_length=20)
+    client_timestamp = models.DateTimeField()
+    result = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("employee", "idempotency_key")
+"""
+
+
+def _parse_event(raw, now):
+    """
+    Validate one queued event, returns (event, error)
+    """
+    key = str(raw.get("idempotency_key") or "").strip()
+    if not key or len(key) > 64:
+        return None, "invalid_idempotency_key"
+
+    event_type = raw.get("type")
+    if event_type not in ("check_in", "check_out"):
+        return {"idempotency_key": key}, "invalid_type"
+
+    # Well-formed but impossible values ("2025-02-30T10:00:00Z") raise;
+    # reject just this event so the rest of the queue still drains
+    try:
+        timestamp = parse_datetime(str(raw.get("timestamp") or ""))
+        if timestamp is not None and timezone.is_naive(timestamp):
+            timestamp = timezone.make_aware(timestamp)
+    except (ValueError, OverflowError):
+        timestamp = None
+    if timestamp is None:
+        return {"idempotency_key": key}, "invalid_timestamp"
+    if timestamp > now + MAX_CLOCK_SKEW:
+        return {"idempotency_key": key}, "timestamp_in_future"
+    if timestamp < now - MAX_EVENT_AGE:
+        return {"idempotency_key": key}, "timestamp_too_old"
+
+    device = str(raw.get("device") or "mobile").strip()
+    if len(device) > MAX_DEVICE_LENGTH:
+        return {"idempotency_key": key}, "invalid_device"
+
+    return {
+        "idempotency_key": key,
+        "type": event_type,
+        "timestamp": timestamp,
+        "device": device,
+        "latitude": raw.get("latitude"),
+        "longitude": raw.get("longitude"),
+    }, None
+
+
+def _apply_event(event, records, employee, schedule):
+    """
+    Apply one event to the in-memory attendance records.
+    Conflict rules: earliest check-in wins, latest check-out wins,
+    a check-out must come after the day's check-in. Days are resolved
+    with the same shift rules as CheckInView/CheckOutView.
+    """
+    timestamp = event["timestamp"]
+
+    if event["type"] == "check_in":
+        # Night shifts that started yesterday keep yesterday's date
+        day = resolve_shift_date(employee.id, timestamp, schedule)
+        attendance = records.get(day)
+
+        # Only the coordinates recorded with the event: the sync request's
+        # IP says where the phone is now, not where it was at check-in
+        latitude, longitude = parse_coordinates(event["latitude"], event["longitude"])
+        allowed, reason, _ = check_location(latitude, longitude, None)
+        # Reported in the sync result whatever the outcome
+        event["location_check"] = reason
+        if not allowed:
+            return "rejected", reason
+
+        if attendance is None:
+            attendance = Attendance(
+                employee=employee,
+                date=day,
+                check_in=timestamp,
+                check_in_device=event["device"],
+                status="present",
+                created_at=timestamp,
+            )
+            records[day] = attendance
+            return "applied", None
+        if attendance.check_in and attendance.check_in <= timestamp:
+            return "ignored", "earlier_check_in_exists"
+        attendance.check_in = timestamp
+        attendance.check_in_device = event["device"]
+        if attendance.status != "completed":
+            attendance.status = "present"
+        attendance._sync_dirty = True
+        return "applied", None
+
+    # check_out
+    day = timezone.localtime(timestamp).date()
+    attendance = records.get(day)
+    if attendance is None:
+        # A night shift check-out after midnight belongs to yesterday's open
+        # record, but only within its checkout window
+        previous_day = day - timedelta(days=1)
+        previous = records.get(previous_day)
+        if (
+            previous and previous.check_in and not previous.check_out
+            and night_shift_still_open(schedule, employee.id, previous_day, timestamp)
+        ):
+            attendance = previous
+    if attendance is None or not attendance.check_in:
+        return "rejected", "no_check_in"
+    if timestamp <= attendance.check_in:
+        return "rejected", "check_out_before_check_in"
+    if attendance.check_out and attendance.check_out >= timestamp:
+        return "ignored", "later_check_out_exists"
+    attendance.check_out = timestamp
+    attendance.check_out_device = event["device"]
+    attendance.status = "completed"
+    attendance._sync_dirty = True
+    return "applied", None
+
+
+def _serialize_attendance(attendance):
+    return {
+        "date": attendance.date.strftime("%Y-%m-%d"),
+        "check_in_time": attendance.check_in.strftime("%H:%M:%S") if attendance.check_in else None,
+        "check_out_time": attendance.check_out.strftime("%H:%M:%S") if attendance.check_out else None,
+        "status": "checked_in" if attendance.check_in and not attendance.check_out else "completed",
+        "work_hours": attendance.total_work_hours or 0,
+        "overtime_hours": attendance.overtime_hours or 0,
+        "is_overtime": bool(attendance.is_overtime),
+    }
+
+
+class AttendanceSyncView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        try:
+            employee = Employee.objects.get(id=request.user.id)
+            now = timezone.now()
+
+            raw_events = request.data.get("events")
+            if not isinstance(raw_events, list) or not raw_events:
+                return Response({
+                    "error": "events must be a non-empty list"
+                }, status=status.HTTP_400_BAD_REQUEST)
+            if len(raw_events) > MAX_SYNC_EVENTS:
+                return Response({
+                    "error": f"At most {MAX_SYNC_EVENTS} events per sync"
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            results = []
+            events = []
+            for raw in raw_events:
+                event, error = _parse_event(raw if isinstance(raw, dict) else {}, now)
+                if error:
+                    results.append({
+                        "idempotency_key": event["idempotency_key"] if event else None,
+                        "result": "rejected",
+                        "reason": error
+                    })
+                else:
+                    events.append(event)
+
+            # Apply in client time order, not queue order
+            events.sort(key=lambda e: e["timestamp"])
+
+            with transaction.atomic():
+                # Serialize syncs per employee: a concurrent retry of the same
+                # batch waits here and then sees this one's keys as duplicates
+                Employee.objects.select_for_update().only("id").get(id=employee.id)
+
+                # Events already applied by an earlier (retried) sync
+                keys = [e["idempotency_key"] for e in events]
+                seen = {
+                    row["idempotency_key"]: row["result"]
+                    for row in AttendanceSyncEvent.objects.filter(
+                        employee=employee, idempotency_key__in=keys
+                    ).values("idempotency_key", "result")
+                }
+
+                # Load every affected day in one locked query
+                days = {timezone.localtime(e["timestamp"]).date() for e in events}
+                if days:
+                    days |= {d - timedelta(days=1) for d in days}
+                records = {
+                    a.date: a for a in Attendance.objects.select_for_update().filter(
+                        employee=employee, date__in=days
+                    )
+                }
+
+                # One schedule covering every affected day, for day resolution and hours
+                schedule = ScheduleCache(min(days), max(days), employee_ids=[employee.id]) if days else None
+
+                new_events = []
+                for event in events:
+                    key = event["idempotency_key"]
+                    if key in seen:
+                        results.append(dict(seen[key], duplicate=True))
+                        continue
+                    outcome, reason = _apply_event(event, records, employee, schedule)
+                    result = {"idempotency_key": key, "result": outcome, "reason": reason}
+                    if "location_check" in event:
+                        result["location_check"] = event["location_check"]
+                    results.append(result)
+                    seen[key] = result
+                    new_events.append(AttendanceSyncEvent(
+                        employee=employee,
+                        idempotency_key=key,
+                        event_type=event["type"],
+                        client_timestamp=event["timestamp"],
+                        result=result,
+                    ))
+
+                # Recompute hours for the touched days from the same schedule
+                to_create = [a for a in records.values() if a.pk is None]
+                to_update = [a for a in records.values() if a.pk is not None and getattr(a, "_sync_dirty", False)]
+                touched = to_create + to_update
+                if touched:
+                    for attendance in touched:
+                        if attendance.check_in and attendance.check_out:
+                            shift = schedule.get(employee.id, attendance.date)
+                            apply_shift_metrics(
+                                attendance,
+                                compute_shift_metrics(shift, attendance.check_in, attendance.check_out)
+                            )
+                        attendance.updated_at = now
+
+                if to_create:
+                    Attendance.objects.bulk_create(to_create)
+                if to_update:
+                    Attendance.objects.bulk_update(to_update, [
+                        "check_in", "check_in_device", "check_out", "check_out_device", "status",
+                        "total_work_hours", "late_minutes", "early_leave_minutes",
+                        "overtime_hours", "is_overtime", "updated_at"
+                    ])
+                if new_events:
+                    AttendanceSyncEvent.objects.bulk_create(new_events)
+
+            # Reconciled state the client should replace its local copy with
+            today = timezone.localtime(now).date()
+            state = [_serialize_attendance(a) for a in sorted(records.values(), key=lambda a: a.date)]
+            today_record = records.get(today) or Attendance.objects.filter(employee=employee, date=today).first()
+
+            return Response({
+                "message": "Sync complete",
+                "results": results,
+                "attendance": state,
+                "today": _serialize_attendance(today_record) if today_record else {
+                    "date": today.strftime("%Y-%m-%d"),
+                    "status": "not_checked_in"
+                },
+                "server_time": now.isoformat()
+            }, status=status.HTTP_200_OK)
+
+        except Employee.DoesNotExist:
+            return Response({
+                "error": "Employee not found"
+            }, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            return Response({
+                "error": f"Attendance sync failed: {str(e)}"
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
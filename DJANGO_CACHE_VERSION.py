@@ -0,0 +1,27 @@
+# Cross-process invalidation for in-memory caches
+# Add this file to your Django app as cache_version.py. Each worker keeps
+# its compiled structure in memory and compares the version token it was
+# built with against the one in the shared Django cache (Redis/Memcached),
+# so invalidating in one worker is seen by all of them.
+
+import uuid
+from django.core.cache import cache
+
+
+def get_version(key):
+    """
+    Current version token for key, creating one if missing or evicted
+    """
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key):
+    """
+    Invalidate every worker's copy. A fresh token (not a counter) so an
+    evicted key can never come back with a value a worker already holds.
+    """
+    cache.set(key, uuid.uuid4().hex, None)
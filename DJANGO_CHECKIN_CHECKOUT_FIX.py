@@ -6,6 +6,17 @@ from datetime import datetime, date
 from django.contrib.auth.decorators import login_required
 from django.utils.decorators import method_decorator
 from rest_framework.permissions import IsAuthenticated
+from .location_policy import validate_check_in_location
+from .shift_engine import (
+    ScheduleCache,
+    resolve_shift_date,
+    current_attendance,
+    compute_shift_metrics,
+    apply_shift_metrics,
+)
+from .fast_serializers import format_time
+from .renderers import FastJSONRenderer
+from .db_router import ReplicaReadMixin
 
 class CheckInView(APIView):
     permission_classes = [IsAuthenticated]
@@ -14,7 +25,11 @@ class CheckInView(APIView):
         try:
             # Get employee from authenticated user
             employee = Employee.objects.get(id=request.user.id)
-            today = timezone.now().date()
+            now = timezone.now()
+            
+            # Night shifts that started yesterday keep yesterday's date
+            schedule = ScheduleCache.for_employee(employee.id, now)
+            today = resolve_shift_date(employee.id, now, schedule)
             
             # Check for existing attendance record
             attendance = Attendance.objects.filter(employee=employee, date=today).first()
@@ -26,6 +41,14 @@ class CheckInView(APIView):
                     "check_in_time": attendance.check_in.strftime("%H:%M:%S")
                 }, status=status.HTTP_400_BAD_REQUEST)
             
+            # Validate office geofence / allowed IP range
+            allowed, reason, site = validate_check_in_location(request)
+            if not allowed:
+                return Response({
+                    "error": "Check-in is only allowed from an office location",
+                    "reason": reason
+                }, status=status.HTTP_403_FORBIDDEN)
+            
             # Get device information
             user_agent = request.headers.get("User-Agent", "")
             device_type = detect_device_type(user_agent)
@@ -35,17 +58,17 @@ class CheckInView(APIView):
                 attendance = Attendance(
                     employee=employee,
                     date=today,
-                    check_in=timezone.now(),
+                    check_in=now,
                     check_in_device=device_type,
                     status="present",  # Set status to present on check-in
-                    created_at=timezone.now(),
-                    updated_at=timezone.now(),
+                    created_at=now,
+                    updated_at=now,
                 )
             else:
-                attendance.check_in = timezone.now()
+                attendance.check_in = now
                 attendance.check_in_device = device_type
                 attendance.status = "present"
-                attendance.updated_at = timezone.now()
+                attendance.updated_at = now
             
             attendance.save()
             
@@ -53,6 +76,10 @@ class CheckInView(APIView):
                 "message": "Check-in successful",
                 "check_in_time": attendance.check_in.strftime("%H:%M:%S"),
                 "device": device_type,
+                "location": site,
+                # Policy outcome, also when it passed or is not enforced
+                # ("unenforced_outside_geofence"), for monitoring before rollout
+                "location_check": reason,
                 "date": today.strftime("%Y-%m-%d")
             }, status=status.HTTP_200_OK)
             
@@ -73,10 +100,11 @@ class CheckOutView(APIView):
         try:
             # Get employee from authenticated user
             employee = Employee.objects.get(id=request.user.id)
-            today = timezone.now().date()
+            now = timezone.now()
             
-            # Get today's attendance record
-            attendance = Attendance.objects.filter(employee=employee, date=today).first()
+            # Get the open attendance record (may be yesterday's for night shifts)
+            schedule = ScheduleCache.for_employee(employee.id, now)
+            attendance, _ = current_attendance(employee, now, schedule)
             
             # Validation checks
             if not attendance:
@@ -100,28 +128,18 @@ class CheckOutView(APIView):
             device_type = detect_device_type(user_agent)
             
             # Set check-out time
-            checkout_time = timezone.now()
-            attendance.check_out = checkout_time
+            attendance.check_out = now
             attendance.check_out_device = device_type
             
-            # Calculate work hours (timezone safe)
-            time_delta = attendance.check_out - attendance.check_in
-            total_seconds = time_delta.total_seconds()
-            hours = round(total_seconds / 3600, 2)
-            attendance.total_work_hours = hours
-            
-            # Calculate overtime (assuming 8 hours is standard, adjust as needed)
-            standard_hours = 8.0
-            if hours > standard_hours:
-                attendance.is_overtime = True
-                attendance.overtime_hours = round(hours - standard_hours, 2)
-            else:
-                attendance.is_overtime = False
-                attendance.overtime_hours = 0.0
+            # Calculate work hours, lateness and overtime from the employee's shift
+            shift = schedule.get(employee.id, attendance.date)
+            metrics = compute_shift_metrics(shift, attendance.check_in, attendance.check_out)
+            apply_shift_metrics(attendance, metrics)
+            hours = metrics["work_hours"]
             
             # Update status and timestamp
             attendance.status = "completed"
-            attendance.updated_at = timezone.now()
+            attendance.updated_at = now
             attendance.save()
             
             return Response({
@@ -131,8 +149,11 @@ class CheckOutView(APIView):
                 "work_hours": hours,
                 "overtime_hours": attendance.overtime_hours,
                 "is_overtime": attendance.is_overtime,
+                "late_minutes": attendance.late_minutes,
+                "early_leave_minutes": attendance.early_leave_minutes,
+                "shift": shift.name if shift else None,
                 "device": device_type,
-                "date": today.strftime("%Y-%m-%d")
+                "date": attendance.date.strftime("%Y-%m-%d")
             }, status=status.HTTP_200_OK)
             
         except Employee.DoesNotExist:
@@ -164,15 +185,18 @@ def detect_device_type(user_agent):
 
 
 # Additional view for getting today's attendance status
-class AttendanceStatusView(APIView):
+class AttendanceStatusView(ReplicaReadMixin, APIView):
     permission_classes = [IsAuthenticated]
+    renderer_classes = [FastJSONRenderer]
     
     def get(self, request):
         try:
             employee = Employee.objects.get(id=request.user.id)
-            today = timezone.now().date()
+            now = timezone.now()
             
-            attendance = Attendance.objects.filter(employee=employee, date=today).first()
+            # An open night shift from yesterday takes precedence
+            schedule = ScheduleCache.for_employee(employee.id, now)
+            attendance, today = current_attendance(employee, now, schedule)
             
             if not attendance:
                 return Response({
@@ -184,11 +208,13 @@ class AttendanceStatusView(APIView):
             response_data = {
                 "status": "checked_in" if attendance.check_in and not attendance.check_out else "completed",
                 "date": today.strftime("%Y-%m-%d"),
-                "check_in_time": attendance.check_in.strftime("%H:%M:%S") if attendance.check_in else None,
-                "check_out_time": attendance.check_out.strftime("%H:%M:%S") if attendance.check_out else None,
+                "check_in_time": format_time(attendance.check_in),
+                "check_out_time": format_time(attendance.check_out),
                 "work_hours": attendance.total_work_hours if attendance.total_work_hours else 0,
                 "overtime_hours": attendance.overtime_hours if attendance.overtime_hours else 0,
-                "is_overtime": attendance.is_overtime if attendance.is_overtime else False
+                "is_overtime": attendance.is_overtime if attendance.is_overtime else False,
+                "late_minutes": attendance.late_minutes or 0,
+                "early_leave_minutes": attendance.early_leave_minutes or 0
             }
             
             return Response(response_data, status=status.HTTP_200_OK)
@@ -8,8 +8,12 @@ from django.utils import timezone
 from datetime import datetime, timedelta
 from django.db.models import Count, Q
 from calendar import monthrange
+from .fast_serializers import serialize_today_status, format_time, format_short_time, format_day_label
+from .renderers import FastJSONRenderer
+from .shift_engine import ScheduleCache, current_attendance
+from .db_router import ReplicaReadMixin
 
-class AttendanceSummaryView(APIView):
+class AttendanceSummaryView(ReplicaReadMixin, APIView):
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
@@ -65,7 +69,7 @@ class AttendanceSummaryView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class LeaveBalanceView(APIView):
+class LeaveBalanceView(ReplicaReadMixin, APIView):
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
@@ -113,15 +117,18 @@ class LeaveBalanceView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class AttendanceStatusView(APIView):
+class AttendanceStatusView(ReplicaReadMixin, APIView):
     permission_classes = [IsAuthenticated]
+    renderer_classes = [FastJSONRenderer]
     
     def get(self, request):
         try:
             employee = Employee.objects.get(id=request.user.id)
-            today = timezone.now().date()
+            now = timezone.now()
             
-            attendance = Attendance.objects.filter(employee=employee, date=today).first()
+            # Local shift date; an open night shift from yesterday takes precedence
+            schedule = ScheduleCache.for_employee(employee.id, now)
+            attendance, today = current_attendance(employee, now, schedule)
             
             if not attendance:
                 return Response({
@@ -130,23 +137,10 @@ class AttendanceStatusView(APIView):
                     "date": today.strftime("%Y-%m-%d")
                 }, status=status.HTTP_200_OK)
             
-            # Determine status
-            if attendance.check_in and not attendance.check_out:
-                status_text = "checked_in"
-            elif attendance.check_in and attendance.check_out:
-                status_text = "completed"
-            else:
-                status_text = "not_checked_in"
-            
-            response_data = {
-                "status": status_text,
-                "date": today.strftime("%Y-%m-%d"),
-                "check_in_time": attendance.check_in.strftime("%H:%M:%S") if attendance.check_in else None,
-                "check_out_time": attendance.check_out.strftime("%H:%M:%S") if attendance.check_out else None,
-                "work_hours": attendance.total_work_hours if attendance.total_work_hours else 0,
-                "overtime_hours": attendance.overtime_hours if attendance.overtime_hours else 0,
-                "is_overtime": attendance.is_overtime if attendance.is_overtime else False
-            }
+            response_data = serialize_today_status(
+                today, attendance.check_in, attendance.check_out,
+                attendance.total_work_hours, attendance.overtime_hours, attendance.is_overtime
+            )
             
             return Response(response_data, status=status.HTTP_200_OK)
             
@@ -160,8 +154,9 @@ class AttendanceStatusView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class RecentActivitiesView(APIView):
+class RecentActivitiesView(ReplicaReadMixin, APIView):
     permission_classes = [IsAuthenticated]
+    renderer_classes = [FastJSONRenderer]
     
     def get(self, request):
         try:
@@ -173,19 +168,20 @@ class RecentActivitiesView(APIView):
             recent_attendance = Attendance.objects.filter(
                 employee=employee,
                 created_at__gte=timezone.now() - timedelta(days=7)
-            ).order_by('-created_at')[:3]
+            ).order_by('-created_at').values_list("check_in", "check_out", "created_at")[:3]
             
-            for attendance in recent_attendance:
-                if attendance.check_in:
+            for check_in, check_out, created_at in recent_attendance:
+                day_label = format_day_label(created_at)
+                if check_in:
                     activities.append({
-                        "title": f"Checked in at {attendance.check_in.strftime('%H:%M')}",
-                        "time": attendance.created_at.strftime("%d %b %Y"),
+                        "title": f"Checked in at {format_short_time(check_in)}",
+                        "time": day_label,
                         "type": "checkin"
                     })
-                if attendance.check_out:
+                if check_out:
                     activities.append({
-                        "title": f"Checked out at {attendance.check_out.strftime('%H:%M')}",
-                        "time": attendance.created_at.strftime("%d %b %Y"),
+                        "title": f"Checked out at {format_short_time(check_out)}",
+                        "time": day_label,
                         "type": "checkout"
                     })
             
@@ -217,17 +213,19 @@ class RecentActivitiesView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class DashboardDataView(APIView):
+class DashboardDataView(ReplicaReadMixin, APIView):
     permission_classes = [IsAuthenticated]
+    renderer_classes = [FastJSONRenderer]
     
     def get(self, request):
         try:
             employee = Employee.objects.get(id=request.user.id)
             
             # Get all dashboard data in one call
-            current_month = timezone.now().month
-            current_year = timezone.now().year
-            today = timezone.now().date()
+            now = timezone.now()
+            local_today = timezone.localtime(now).date()
+            current_month = local_today.month
+            current_year = local_today.year
             
             # Attendance summary
             attendance_records = Attendance.objects.filter(
@@ -241,11 +239,11 @@ class DashboardDataView(APIView):
                 status='present'
             ).count()
             
-            # Today's attendance
-            today_attendance = Attendance.objects.filter(
-                employee=employee, 
-                date=today
-            ).first()
+            # Today's attendance (an open night shift from yesterday takes precedence)
+            schedule = ScheduleCache.for_employee(employee.id, now)
+            today_attendance, _ = current_attendance(employee, now, schedule)
+            today_check_in = today_attendance.check_in if today_attendance else None
+            today_check_out = today_attendance.check_out if today_attendance else None
             
             # Leave balance
             total_leaves = 24
@@ -264,9 +262,9 @@ class DashboardDataView(APIView):
                     "absentDays": 0,  # Calculate based on your logic
                     "leaveDays": 1,   # Calculate based on your logic
                     "todayStatus": {
-                        "isCheckedIn": bool(today_attendance and today_attendance.check_in and not today_attendance.check_out),
-                        "checkInTime": today_attendance.check_in.strftime("%H:%M:%S") if today_attendance and today_attendance.check_in else None,
-                        "checkOutTime": today_attendance.check_out.strftime("%H:%M:%S") if today_attendance and today_attendance.check_out else None
+                        "isCheckedIn": bool(today_check_in and not today_check_out),
+                        "checkInTime": format_time(today_check_in),
+                        "checkOutTime": format_time(today_check_out)
                     }
                 },
                 "leaves": {
@@ -0,0 +1,180 @@
+# Read-replica routing for the dashboard read paths
+# Add this file to your Django app as db_router.py, then configure
+# settings.py as shown below.
+
+import contextvars
+import itertools
+import threading
+from django.conf import settings
+from django.core.cache import cache
+
+# After a caller writes, their reads stay on the primary this long
+# (should exceed the worst expected replication lag)
+REPLICATION_LAG_SECONDS = getattr(settings, "REPLICATION_LAG_SECONDS", 5)
+
+PRIMARY_DB = "default"
+
+# Methods that never write, everything else counts as a write
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Enabled by ReplicaReadMixin / use_replica_reads; reads go to the primary by default
+_replica_reads = contextvars.ContextVar("replica_reads", default=False)
+
+
+# settings.py:
+"""
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.postgresql",
+        "HOST": "db-primary", "NAME": "hrms", "USER": "hrms", "PASSWORD": "...",
+        # Persistent connections; Django 5.1+ with psycopg 3 can use a real pool
+        "CONN_MAX_AGE": 60,
+        "CONN_HEALTH_CHECKS": True,
+        # "CONN_MAX_AGE": 0, "OPTIONS": {"pool": {"min_size": 2, "max_size": 20}},
+    },
+    "replica": {
+        "ENGINE": "django.db.backends.postgresql",
+        "HOST": "db-replica", "NAME": "hrms", "USER": "hrms_ro", "PASSWORD": "...",
+        "CONN_MAX_AGE": 60,
+        "CONN_HEALTH_CHECKS": True,
+        "TEST": {"MIRROR": "default"},
+    },
+}
+# Required: a cache shared by every worker process. record_write() and
+# cache_version live here; with the default LocMemCache each process has
+# its own copy, so a check-in recorded by one worker is invisible to the
+# worker serving the next dashboard read (stale read-your-writes), and
+# version bumps never reach the other workers.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": "redis://cache:6379/1",
+    },
+    # or "django.core.cache.backends.memcached.PyMemcacheCache", "LOCATION": "cache:11211"
+}
+
+DATABASE_ROUTERS = ["yourapp.db_router.PrimaryReplicaRouter"]
+DATABASE_REPLICAS = ["replica"]
+REPLICATION_LAG_SECONDS = 5
+
+MIDDLEWARE = [
+    ...
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "yourapp.db_router.ReplicaRoutingMiddleware",
+    ...
+]
+"""
+
+
+def _replica_aliases():
+    replicas = getattr(settings, "DATABASE_REPLICAS", None)
+    if replicas is None:
+        replicas = [alias for alias in settings.DATABASES if alias != PRIMARY_DB]
+    return list(replicas)
+
+
+class PrimaryReplicaRouter:
+    """
+    Writes always go to the primary. Reads go to a replica (round robin)
+    only where replica reads are enabled (ReplicaReadMixin views,
+    use_replica_reads blocks), everything else reads from the primary.
+    """
+
+    def __init__(self):
+        self.replicas = _replica_aliases()
+        self._cycle = itertools.cycle(self.replicas) if self.replicas else None
+        self._lock = threading.Lock()
+
+    def db_for_read(self, model, **hints):
+        if not self._cycle or not _replica_reads.get():
+            return PRIMARY_DB
+        with self._lock:
+            return next(self._cycle)
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY_DB
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primary and replicas hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY_DB
+
+
+def _write_key(user_id):
+    return f"db-last-write:{user_id}"
+
+
+def record_write(user_id):
+    """
+    Pin the caller's reads to the primary for the replication lag window.
+    Stored in the shared cache so every worker sees it.
+    """
+    cache.set(_write_key(user_id), True, REPLICATION_LAG_SECONDS)
+
+
+def wrote_recently(user_id):
+    return bool(cache.get(_write_key(user_id)))
+
+
+class use_replica_reads:
+    """
+    Context manager enabling replica reads for the current context,
+    e.g. in reporting jobs: with use_replica_reads(): ...
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._token = None
+
+    def __enter__(self):
+        self._token = _replica_reads.set(self.enabled)
+        return self
+
+    def __exit__(self, *exc):
+        _replica_reads.reset(self._token)
+
+
+class ReplicaReadMixin:
+    """
+    Mix into read-only APIViews (before APIView) to serve their GET
+    requests from a replica. Runs after DRF authentication so the
+    caller's recent writes are known.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        with use_replica_reads(False):
+            return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        user = getattr(request, "user", None)
+        user_id = user.pk if user is not None and user.is_authenticated else None
+        if request.method in SAFE_METHODS and (user_id is None or not wrote_recently(user_id)):
+            _replica_reads.set(True)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Records a write for the caller after every successful non-GET request
+    (check-in, check-out, sync, ...) so ReplicaReadMixin views keep their
+    reads on the primary until the replicas have caught up.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        # DRF copies the authenticated (JWT) user onto the Django request
+        user = getattr(request, "user", None)
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and user is not None
+            and user.is_authenticated
+        ):
+            record_write(user.pk)
+        return response
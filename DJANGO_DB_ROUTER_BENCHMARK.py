@@ -0,0 +1,232 @@
+# Primary load with and without replica routing, on two local SQLite files
+#     pip install django djangorestframework
+#     python DJANGO_DB_ROUTER_BENCHMARK.py
+# Drives DRF views through the Django test client, so the real
+# ReplicaRoutingMiddleware, ReplicaReadMixin and PrimaryReplicaRouter
+# decide where each query goes. Check-in POSTs are followed by dashboard
+# GETs; replication is simulated by copying rows to the replica after
+# REPLICATION_LAG_SECONDS.
+
+import os
+import random
+import shutil
+import tempfile
+import time
+from collections import Counter
+
+import django
+from django.conf import settings
+
+workdir = tempfile.mkdtemp(prefix="hrms-router-")
+settings.configure(
+    DEBUG=False,
+    ALLOWED_HOSTS=["testserver"],
+    ROOT_URLCONF=__name__,
+    DATABASES={
+        "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": os.path.join(workdir, "primary.sqlite3")},
+        "replica": {"ENGINE": "django.db.backends.sqlite3", "NAME": os.path.join(workdir, "replica.sqlite3")},
+    },
+    DATABASE_ROUTERS=[],
+    DATABASE_REPLICAS=["replica"],
+    REPLICATION_LAG_SECONDS=0.05,
+    # One process here, so a local cache is shared by every request; a
+    # real deployment needs Redis/Memcached (see db_router.py settings)
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    MIDDLEWARE=["DJANGO_DB_ROUTER.ReplicaRoutingMiddleware"],
+    INSTALLED_APPS=["django.contrib.contenttypes", "django.contrib.auth", "rest_framework"],
+    REST_FRAMEWORK={
+        "DEFAULT_AUTHENTICATION_CLASSES": [f"{__name__}.EmployeeHeaderAuthentication"],
+        "UNAUTHENTICATED_USER": None,
+    },
+    USE_TZ=True,
+)
+django.setup()
+
+from django.core.cache import cache
+from django.db import connections, models, router
+from django.test import Client
+from django.urls import path
+from django.utils import timezone
+from rest_framework.authentication import BaseAuthentication
+
+
+# Defined before rest_framework.views is imported, which loads the
+# authentication classes named in REST_FRAMEWORK
+class BenchUser:
+    is_authenticated = True
+
+    def __init__(self, pk):
+        self.pk = self.id = pk
+
+
+class EmployeeHeaderAuthentication(BaseAuthentication):
+    """
+    Stand-in for JWT auth: the employee id comes from X-Employee-Id,
+    without a database lookup, so only the views' own queries are counted
+    """
+
+    def authenticate(self, request):
+        employee_id = request.headers.get("X-Employee-Id")
+        return (BenchUser(int(employee_id)), None) if employee_id else None
+
+
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from DJANGO_DB_ROUTER import PrimaryReplicaRouter, ReplicaReadMixin, REPLICATION_LAG_SECONDS
+
+
+class Attendance(models.Model):
+    employee_id = models.IntegerField(db_index=True)
+    date = models.DateField()
+    check_in = models.DateTimeField(null=True)
+    check_out = models.DateTimeField(null=True)
+    status = models.CharField(max_length=20, default="present")
+
+    class Meta:
+        app_label = "bench"
+
+
+pending_replication = []
+
+
+# Views shaped like CheckInView and the dashboard GET endpoints
+class CheckInView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        today = timezone.now().date()
+        if Attendance.objects.filter(employee_id=request.user.id, date=today).exists():
+            return Response({"error": "Already checked in today"}, status=status.HTTP_400_BAD_REQUEST)
+        row = Attendance.objects.create(employee_id=request.user.id, date=today, check_in=timezone.now())
+        pending_replication.append((time.monotonic() + REPLICATION_LAG_SECONDS, row))
+        return Response({"message": "Check-in successful"}, status=status.HTTP_200_OK)
+
+
+class AttendanceStatusView(ReplicaReadMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        today = timezone.now().date()
+        attendance = Attendance.objects.filter(employee_id=request.user.id, date=today).first()
+        return Response({"status": "checked_in" if attendance else "not_checked_in"})
+
+
+class AttendanceSummaryView(ReplicaReadMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        today = timezone.now().date()
+        present = Attendance.objects.filter(employee_id=request.user.id, date__month=today.month).count()
+        return Response({"presentDays": present})
+
+
+class RecentActivityView(ReplicaReadMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        rows = Attendance.objects.filter(employee_id=request.user.id).order_by("-date")[:3]
+        return Response([{"date": str(row.date)} for row in rows])
+
+
+class OverallAttendanceListView(ReplicaReadMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        rows = Attendance.objects.filter(date=timezone.now().date()).values_list("employee_id", flat=True)[:50]
+        return Response(list(rows))
+
+
+urlpatterns = [
+    path("check-in/", CheckInView.as_view()),
+    path("attendance-status/", AttendanceStatusView.as_view()),
+    path("attendance-summary/", AttendanceSummaryView.as_view()),
+    path("recent-activity/", RecentActivityView.as_view()),
+    path("attendance-list/", OverallAttendanceListView.as_view()),
+]
+
+DASHBOARD_URLS = ["/attendance-summary/", "/recent-activity/", "/attendance-list/"]
+
+
+for alias in ("default", "replica"):
+    with connections[alias].schema_editor() as editor:
+        editor.create_model(Attendance)
+
+query_counts = Counter()
+
+
+def counting_wrapper(alias):
+    def wrapper(execute, sql, params, many, context):
+        query_counts[alias] += 1
+        return execute(sql, params, many, context)
+    return wrapper
+
+
+for alias in ("default", "replica"):
+    connections[alias].execute_wrappers.append(counting_wrapper(alias))
+
+
+def replicate(force=False):
+    """
+    Copy rows whose lag has elapsed to the replica (outside the counters)
+    """
+    now = time.monotonic()
+    ready = [row for due, row in pending_replication if force or due <= now]
+    pending_replication[:] = [(due, row) for due, row in pending_replication if not (force or due <= now)]
+    if ready:
+        wrappers = connections["replica"].execute_wrappers
+        saved, wrappers[:] = wrappers[:], []
+        Attendance.objects.using("replica").bulk_create([
+            Attendance(id=row.id, employee_id=row.employee_id, date=row.date, check_in=row.check_in)
+            for row in ready
+        ])
+        wrappers[:] = saved
+
+
+def dashboard(client, employee_id):
+    """
+    One dashboard load; returns whether today's own check-in was visible
+    """
+    headers = {"X-Employee-Id": str(employee_id)}
+    response = client.get("/attendance-status/", headers=headers)
+    for url in DASHBOARD_URLS:
+        client.get(url, headers=headers)
+    return response.json()["status"] == "checked_in"
+
+
+def run(use_router, employees=200, reads_per_checkin=9):
+    Attendance.objects.all().delete()
+    Attendance.objects.using("replica").all().delete()
+    pending_replication.clear()
+    cache.clear()
+    router.routers = [PrimaryReplicaRouter()] if use_router else []
+
+    client = Client()
+    query_counts.clear()
+    stale = 0
+    random.seed(3)
+    started = time.perf_counter()
+    for employee_id in range(employees):
+        response = client.post("/check-in/", headers={"X-Employee-Id": str(employee_id)})
+        assert response.status_code == 200, response.content
+        # First read right after the write must see it (read-your-writes)
+        if not dashboard(client, employee_id):
+            stale += 1
+        for _ in range(reads_per_checkin - 1):
+            replicate()
+            dashboard(client, random.randrange(employee_id + 1))
+        time.sleep(REPLICATION_LAG_SECONDS / 10)
+    replicate(force=True)
+    elapsed = time.perf_counter() - started
+    return dict(query_counts), stale, elapsed
+
+
+if __name__ == "__main__":
+    for label, use_router in (("primary only", False), ("with router", True)):
+        counts, stale, elapsed = run(use_router)
+        total = sum(counts.values())
+        primary = counts.get("default", 0)
+        print(f"{label:13s} primary={primary:5d} replica={counts.get('replica', 0):5d} "
+              f"primary share={primary / total:6.1%}  stale own reads={stale}  ({elapsed:.1f}s)")
+    shutil.rmtree(workdir, ignore_errors=True)
@@ -0,0 +1,87 @@
+# Fast JSON renderer and attendance list view
+# Add the renderer to your app as renderers.py and the view to views.py
+
+from rest_framework.renderers import BaseRenderer
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from .fast_serializers import dumps, serialize_attendance_rows, format_date, ATTENDANCE_COLUMNS
+from .db_router import ReplicaReadMixin
+
+
+class FastJSONRenderer(BaseRenderer):
+    """
+    JSON renderer backed by orjson (stdlib json fallback). Skips DRF's
+    JSONRenderer encoder class and indentation handling.
+    """
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return dumps(data)
+
+
+# To use it everywhere, add to settings.py:
+"""
+REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        "yourapp.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+}
+"""
+
+
+# Longest date range one attendance list request may cover
+MAX_LIST_DAYS = 31
+
+
+# New endpoint, added next to OverallAttendanceListView (which is left as
+# it is). GET Attendance/range/?start=YYYY-MM-DD&end=YYYY-MM-DD, both
+# default to today and span at most MAX_LIST_DAYS days. Response:
+# {"start", "end", "count", "attendance": [...]}, each row with id,
+# employee_id, date, check_in_time, check_out_time, work_hours,
+# overtime_hours, is_overtime and status (see serialize_attendance_rows).
+class AttendanceRangeListView(ReplicaReadMixin, APIView):
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [FastJSONRenderer]
+
+    def get(self, request):
+        try:
+            today = timezone.localdate()
+            try:
+                start = parse_date(request.query_params.get("start") or "") or today
+                end = parse_date(request.query_params.get("end") or "") or start
+            except ValueError:
+                start = end = None
+            if start is None or end is None or end < start:
+                return Response({
+                    "error": "start and end must be valid dates (YYYY-MM-DD) with start <= end"
+                }, status=status.HTTP_400_BAD_REQUEST)
+            if (end - start).days + 1 > MAX_LIST_DAYS:
+                return Response({
+                    "error": f"At most {MAX_LIST_DAYS} days per request"
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            rows = Attendance.objects.filter(date__gte=start, date__lte=end).order_by(
+                "date", "employee_id"
+            ).values_list(*ATTENDANCE_COLUMNS)
+            attendance = serialize_attendance_rows(rows)
+
+            return Response({
+                "start": format_date(start),
+                "end": format_date(end),
+                "count": len(attendance),
+                "attendance": attendance
+            }, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            return Response({
+                "error": f"Failed to get attendance list: {str(e)}"
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,174 @@
+# Lightweight serializers for the attendance read paths
+# Add this file to your Django app as fast_serializers.py. No Django
+# imports here, so the helpers can be benchmarked on their own:
+#     python DJANGO_FAST_SERIALIZERS.py
+
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib encoder
+    orjson = None
+
+
+# Precomputed "00".."59" so time formatting is three lookups and a join
+_TWO_DIGITS = [f"{i:02d}" for i in range(60)]
+
+_MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+# Columns pulled with values_list() for attendance rows
+ATTENDANCE_COLUMNS = (
+    "id", "employee_id", "date", "check_in", "check_out",
+    "total_work_hours", "overtime_hours", "is_overtime", "status",
+)
+
+
+def dumps(data):
+    """
+    Encode to JSON bytes, orjson when installed
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+
+
+def format_time(value):
+    """
+    Same output as value.strftime("%H:%M:%S"), None passes through
+    """
+    if value is None:
+        return None
+    return f"{_TWO_DIGITS[value.hour]}:{_TWO_DIGITS[value.minute]}:{_TWO_DIGITS[value.second]}"
+
+
+def format_short_time(value):
+    """
+    Same output as value.strftime("%H:%M")
+    """
+    if value is None:
+        return None
+    return f"{_TWO_DIGITS[value.hour]}:{_TWO_DIGITS[value.minute]}"
+
+
+def format_date(value):
+    """
+    Same output as value.strftime("%Y-%m-%d")
+    """
+    if value is None:
+        return None
+    return f"{value.year:04d}-{_TWO_DIGITS[value.month]}-{value.day:02d}"
+
+
+def format_day_label(value):
+    """
+    Same output as value.strftime("%d %b %Y")
+    """
+    return f"{value.day:02d} {_MONTHS[value.month - 1]} {value.year:04d}"
+
+
+def attendance_status(check_in, check_out):
+    if check_in and not check_out:
+        return "checked_in"
+    if check_in and check_out:
+        return "completed"
+    return "not_checked_in"
+
+
+def serialize_attendance_rows(rows):
+    """
+    Turn ATTENDANCE_COLUMNS tuples into response dicts in one pass.
+    Ids stay numbers. Dates repeat heavily in list views, so each is
+    formatted once.
+    """
+    date_cache = {}
+    result = []
+    append = result.append
+    for row_id, employee_id, day, check_in, check_out, hours, overtime, is_overtime, row_status in rows:
+        day_text = date_cache.get(day)
+        if day_text is None:
+            day_text = date_cache[day] = format_date(day)
+        append({
+            "id": row_id,
+            "employee_id": employee_id,
+            "date": day_text,
+            "check_in_time": format_time(check_in),
+            "check_out_time": format_time(check_out),
+            "work_hours": hours or 0,
+            "overtime_hours": overtime or 0,
+            "is_overtime": bool(is_overtime),
+            "status": row_status,
+        })
+    return result
+
+
+def serialize_today_status(day, check_in, check_out, hours=0, overtime=0, is_overtime=False):
+    """
+    Today's status block shared by AttendanceStatusView and the dashboard
+    """
+    return {
+        "status": attendance_status(check_in, check_out),
+        "date": format_date(day),
+        "check_in_time": format_time(check_in),
+        "check_out_time": format_time(check_out),
+        "work_hours": hours or 0,
+        "overtime_hours": overtime or 0,
+        "is_overtime": bool(is_overtime),
+    }
+
+
+# Benchmark against the current strftime + dict + stdlib json path
+if __name__ == "__main__":
+    import random
+    import time
+    from datetime import date, datetime, timedelta, timezone as dt_timezone
+
+    random.seed(7)
+    row_count = 5000
+    rows = []
+    for i in range(row_count):
+        day = date(2025, 1, 1) + timedelta(days=i % 30)
+        check_in = datetime(day.year, day.month, day.day, 9, random.randrange(60), random.randrange(60),
+                            tzinfo=dt_timezone.utc)
+        check_out = check_in + timedelta(hours=random.uniform(6, 10)) if i % 4 else None
+        hours = round((check_out - check_in).total_seconds() / 3600, 2) if check_out else 0.0
+        rows.append((i, i % 1000, day, check_in, check_out, hours, max(hours - 8, 0), hours > 8,
+                     "completed" if check_out else "present"))
+
+    def current_path():
+        data = []
+        for row_id, employee_id, day, check_in, check_out, hours, overtime, is_overtime, row_status in rows:
+            data.append({
+                "id": row_id,
+                "employee_id": employee_id,
+                "date": day.strftime("%Y-%m-%d"),
+                "check_in_time": check_in.strftime("%H:%M:%S") if check_in else None,
+                "check_out_time": check_out.strftime("%H:%M:%S") if check_out else None,
+                "work_hours": hours if hours else 0,
+                "overtime_hours": overtime if overtime else 0,
+                "is_overtime": is_overtime if is_overtime else False,
+                "status": row_status,
+            })
+        # DRF's JSONRenderer defaults: compact separators, ensure_ascii=False
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def fast_path():
+        return dumps(serialize_attendance_rows(rows))
+
+    assert json.loads(current_path()) == json.loads(fast_path())
+
+    def measure(fn, repeat=20):
+        fn()
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        size = 0
+        for _ in range(repeat):
+            size = len(fn())
+        cpu = (time.process_time() - cpu_start) / repeat
+        wall = (time.perf_counter() - wall_start) / repeat
+        return size, cpu, wall
+
+    print(f"rows per response: {row_count}, encoder: {'orjson' if orjson else 'json'}")
+    for label, fn in (("current", current_path), ("fast", fast_path)):
+        size, cpu, wall = measure(fn)
+        print(f"{label:8s} {size / 1024:8.1f} KiB  cpu {cpu * 1000:7.2f} ms/response  "
+              f"{size / wall / 1e6:7.1f} MB/s")
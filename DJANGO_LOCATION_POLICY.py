@@ -0,0 +1,396 @@
+# Location policy engine for geofenced / IP-restricted check-in
+# Add this file to your Django app as location_policy.py and import
+# validate_check_in_location in the view that handles check-in.
+
+import bisect
+import ipaddress
+import math
+import threading
+from django.conf import settings
+from .cache_version import get_version, bump_version
+
+# Size of a grid cell in degrees (~1.1 km at the equator)
+GRID_CELL_DEGREES = 0.01
+
+EARTH_RADIUS_METERS = 6371000.0
+
+
+# settings.py: number of reverse proxies in front of Django that append to
+# X-Forwarded-For (e.g. 1 for nginx). Leave 0 when Django is reached directly.
+"""
+TRUSTED_PROXY_COUNT = 1
+
+# Reject check-ins that fail the policy. Off by default until every client
+# sends its device latitude/longitude; failures are still reported.
+LOCATION_POLICY_ENFORCED = True
+"""
+
+
+# Expected model (adjust names to match your project):
+"""
+class OfficeLocation(models.Model):
+    name = models.CharField(max_length=100)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    radius_meters = models.FloatField(default=200.0)
+    # Optional polygon as a list of [lat, lng] pairs, overrides the radius
+    polygon = models.JSONField(null=True, blank=True)
+    # Optional list of CIDRs, e.g. ["10.0.0.0/8", "203.0.113.5/32"]
+    allowed_ips = models.JSONField(null=True, blank=True)
+    is_active = models.BooleanField(default=True)
+"""
+
+
+def haversine_meters(lat1, lng1, lat2, lng2):
+    """
+    Great-circle distance between two points in meters
+    """
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * math.asin(math.sqrt(a))
+
+
+def point_in_polygon(lat, lng, polygon):
+    """
+    Ray casting test, polygon is a list of (lat, lng) tuples
+    """
+    inside = False
+    j = len(polygon) - 1
+    for i in range(len(polygon)):
+        lat_i, lng_i = polygon[i]
+        lat_j, lng_j = polygon[j]
+        if (lng_i > lng) != (lng_j > lng):
+            cross_lat = (lat_j - lat_i) * (lng - lng_i) / (lng_j - lng_i) + lat_i
+            if lat < cross_lat:
+                inside = not inside
+        j = i
+    return inside
+
+
+class Geofence:
+    """
+    A single office area, either a circle (center + radius) or a polygon
+    """
+
+    def __init__(self, site_id, name, latitude=None, longitude=None, radius_meters=0.0, polygon=None):
+        self.site_id = site_id
+        self.name = name
+        self.latitude = latitude
+        self.longitude = longitude
+        self.radius_meters = radius_meters or 0.0
+        self.polygon = [tuple(p) for p in polygon] if polygon else None
+
+        # Bounding box used to register the fence in the grid
+        if self.polygon:
+            lats = [p[0] for p in self.polygon]
+            lngs = [p[1] for p in self.polygon]
+            self.bbox = (min(lats), min(lngs), max(lats), max(lngs))
+        else:
+            d_lat = self.radius_meters / 111320.0
+            cos_lat = max(math.cos(math.radians(latitude)), 1e-6)
+            d_lng = self.radius_meters / (111320.0 * cos_lat)
+            self.bbox = (latitude - d_lat, longitude - d_lng, latitude + d_lat, longitude + d_lng)
+
+    def contains(self, lat, lng):
+        if self.polygon:
+            return point_in_polygon(lat, lng, self.polygon)
+        return haversine_meters(lat, lng, self.latitude, self.longitude) <= self.radius_meters
+
+
+class GeofenceIndex:
+    """
+    Uniform grid over lat/lng. Every fence is registered in each cell its
+    bounding box touches, so a lookup only tests the few fences in one cell.
+    """
+
+    def __init__(self, fences, cell_degrees=GRID_CELL_DEGREES):
+        self.cell_degrees = cell_degrees
+        self.cells = {}
+        for fence in fences:
+            min_lat, min_lng, max_lat, max_lng = fence.bbox
+            row_start, col_start = self._cell(min_lat, min_lng)
+            row_end, col_end = self._cell(max_lat, max_lng)
+            for row in range(row_start, row_end + 1):
+                for col in range(col_start, col_end + 1):
+                    self.cells.setdefault((row, col), []).append(fence)
+
+    def _cell(self, lat, lng):
+        return (math.floor(lat / self.cell_degrees), math.floor(lng / self.cell_degrees))
+
+    def find(self, lat, lng):
+        """
+        Return the first fence containing the point, or None
+        """
+        for fence in self.cells.get(self._cell(lat, lng), ()):
+            if fence.contains(lat, lng):
+                return fence
+        return None
+
+
+class IpAllowlist:
+    """
+    CIDR allowlist compiled into sorted, merged integer intervals.
+    Lookup is a single bisect per address family.
+    """
+
+    def __init__(self, entries):
+        # entries: iterable of (cidr, site_id)
+        ranges = {4: [], 6: []}
+        for cidr, site_id in entries:
+            try:
+                network = ipaddress.ip_network(cidr.strip(), strict=False)
+            except ValueError:
+                continue
+            ranges[network.version].append(
+                (int(network.network_address), int(network.broadcast_address), site_id)
+            )
+
+        self.starts = {}
+        self.intervals = {}
+        for version, items in ranges.items():
+            items.sort()
+            merged = []
+            for start, end, site_id in items:
+                if merged and start <= merged[-1][1] + 1:
+                    if end > merged[-1][1]:
+                        merged[-1] = (merged[-1][0], end, merged[-1][2])
+                else:
+                    merged.append((start, end, site_id))
+            self.intervals[version] = merged
+            self.starts[version] = [item[0] for item in merged]
+
+    def __len__(self):
+        return sum(len(items) for items in self.intervals.values())
+
+    def find(self, ip):
+        """
+        Return the site id of the range containing ip, or None
+        """
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            return None
+        value = int(address)
+        starts = self.starts.get(address.version, [])
+        pos = bisect.bisect_right(starts, value) - 1
+        if pos < 0:
+            return None
+        start, end, site_id = self.intervals[address.version][pos]
+        return site_id if value <= end else None
+
+
+class LocationPolicy:
+    """
+    Compiled geofence index + IP allowlist. Built once, shared by all requests.
+    """
+
+    def __init__(self, fences, ip_entries):
+        self.has_fences = bool(fences)
+        self.geofences = GeofenceIndex(fences)
+        self.allowlist = IpAllowlist(ip_entries)
+
+    def validate(self, latitude=None, longitude=None, ip=None):
+        """
+        Returns (allowed, reason, site_name). A check-in passes when it is
+        inside any office geofence or comes from an allowed IP range.
+        With no sites configured every check-in is allowed.
+        """
+        if not self.has_fences and not len(self.allowlist):
+            return True, "no_policy", None
+
+        if ip and len(self.allowlist):
+            site_id = self.allowlist.find(ip)
+            if site_id is not None:
+                return True, "ip_allowed", site_id
+
+        if latitude is not None and longitude is not None and self.has_fences:
+            fence = self.geofences.find(latitude, longitude)
+            if fence:
+                return True, "inside_geofence", fence.name
+            return False, "outside_geofence", None
+
+        return False, "location_required", None
+
+
+# Shared cache key holding the current policy version
+POLICY_VERSION_KEY = "location-policy-version"
+
+_policy = None
+_policy_version = None
+_policy_lock = threading.Lock()
+
+
+def build_location_policy(sites):
+    """
+    Compile a policy from an iterable of site dicts with keys:
+    id, name, latitude, longitude, radius_meters, polygon, allowed_ips
+    """
+    fences = []
+    ip_entries = []
+    for site in sites:
+        if site.get("polygon") or (site.get("latitude") is not None and site.get("longitude") is not None):
+            fences.append(Geofence(
+                site_id=site.get("id"),
+                name=site.get("name"),
+                latitude=site.get("latitude"),
+                longitude=site.get("longitude"),
+                radius_meters=site.get("radius_meters"),
+                polygon=site.get("polygon"),
+            ))
+        for cidr in site.get("allowed_ips") or []:
+            ip_entries.append((cidr, site.get("name")))
+    return LocationPolicy(fences, ip_entries)
+
+
+def get_location_policy():
+    """
+    Return this worker's compiled policy, recompiling it from
+    OfficeLocation when another worker has bumped the shared version
+    """
+    global _policy, _policy_version
+    version = get_version(POLICY_VERSION_KEY)
+    if _policy is None or _policy_version != version:
+        with _policy_lock:
+            if _policy is None or _policy_version != version:
+                # From the primary, never a lagging replica (see get_shift_catalog).
+                # Imported here: db_router reads settings at import, and this
+                # module's benchmark runs without them
+                from .db_router import use_replica_reads
+                with use_replica_reads(False):
+                    sites = list(OfficeLocation.objects.filter(is_active=True).values(
+                        "id", "name", "latitude", "longitude", "radius_meters", "polygon", "allowed_ips"
+                    ))
+                _policy = build_location_policy(sites)
+                _policy_version = version
+    return _policy
+
+
+def invalidate_location_policy(*args, **kwargs):
+    """
+    Invalidate the policy in every worker; connect to OfficeLocation post_save/post_delete
+    """
+    bump_version(POLICY_VERSION_KEY)
+
+
+# Connect the invalidation in your app (e.g. apps.py ready()):
+"""
+from django.db.models.signals import post_save, post_delete
+post_save.connect(invalidate_location_policy, sender=OfficeLocation)
+post_delete.connect(invalidate_location_policy, sender=OfficeLocation)
+"""
+
+
+def get_client_ip(request):
+    """
+    Client IP from REMOTE_ADDR. X-Forwarded-For is only read when
+    TRUSTED_PROXY_COUNT proxies sit in front of Django; each appends the
+    address it saw, so the client is that many hops from the right.
+    Anything further left is client-supplied and ignored.
+    """
+    trusted_proxies = getattr(settings, "TRUSTED_PROXY_COUNT", 0)
+    if not trusted_proxies:
+        return request.META.get("REMOTE_ADDR")
+
+    forwarded = request.META.get("HTTP_X_FORWARDED_FOR", "")
+    hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+    if len(hops) < trusted_proxies:
+        # Request did not pass through the expected proxies, trust nothing
+        return None
+    return hops[-trusted_proxies]
+
+
+def check_location(latitude, longitude, ip):
+    """
+    Policy result with LOCATION_POLICY_ENFORCED applied. When enforcement
+    is off a failing check-in is allowed and the reason is prefixed
+    with "unenforced_".
+    """
+    allowed, reason, site = get_location_policy().validate(latitude, longitude, ip)
+    if not allowed and not getattr(settings, "LOCATION_POLICY_ENFORCED", False):
+        return True, f"unenforced_{reason}", None
+    return allowed, reason, site
+
+
+def parse_coordinates(latitude, longitude):
+    """
+    Float (latitude, longitude) from request values, (None, None) if invalid
+    """
+    try:
+        latitude = float(latitude) if latitude is not None else None
+        longitude = float(longitude) if longitude is not None else None
+    except (TypeError, ValueError):
+        return None, None
+    return latitude, longitude
+
+
+def validate_check_in_location(request):
+    """
+    Validate the check-in request against the office policy.
+    Reads optional "latitude"/"longitude" from the request body.
+    """
+    latitude, longitude = parse_coordinates(request.data.get("latitude"), request.data.get("longitude"))
+    return check_location(latitude, longitude, get_client_ip(request))
+
+
+# Quick benchmark (from the project root): python -m yourapp.location_policy
+if __name__ == "__main__":
+    import random
+    import time
+
+    random.seed(42)
+    site_count = 5000
+    sites = []
+    for i in range(site_count):
+        lat = random.uniform(8.0, 35.0)
+        lng = random.uniform(68.0, 97.0)
+        site = {
+            "id": i,
+            "name": f"Office {i}",
+            "latitude": lat,
+            "longitude": lng,
+            "radius_meters": random.uniform(100, 500),
+            "allowed_ips": [f"10.{i // 128}.{(i % 128) * 2}.0/24"],
+        }
+        if i % 5 == 0:
+            d = 0.003
+            site["polygon"] = [[lat - d, lng - d], [lat - d, lng + d], [lat + d, lng + d], [lat + d, lng - d]]
+        sites.append(site)
+
+    start = time.perf_counter()
+    policy = build_location_policy(sites)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    points = []
+    for _ in range(20000):
+        site = random.choice(sites)
+        points.append((site["latitude"] + random.uniform(-0.004, 0.004),
+                       site["longitude"] + random.uniform(-0.004, 0.004)))
+    ips = [f"10.{random.randrange(40)}.{random.randrange(256)}.{random.randrange(256)}" for _ in range(20000)]
+
+    start = time.perf_counter()
+    for lat, lng in points:
+        policy.validate(lat, lng, None)
+    geo_us = (time.perf_counter() - start) / len(points) * 1e6
+
+    start = time.perf_counter()
+    for ip in ips:
+        policy.validate(None, None, ip)
+    ip_us = (time.perf_counter() - start) / len(ips) * 1e6
+
+    # Naive baseline: loop over every site for each point
+    naive_fences = [f for cell in policy.geofences.cells.values() for f in cell]
+    naive_fences = list({id(f): f for f in naive_fences}.values())
+    sample = points[:500]
+    start = time.perf_counter()
+    for lat, lng in sample:
+        for fence in naive_fences:
+            if fence.contains(lat, lng):
+                break
+    naive_us = (time.perf_counter() - start) / len(sample) * 1e6
+
+    print(f"sites={site_count} build={build_ms:.1f}ms cells={len(policy.geofences.cells)}")
+    print(f"geofence lookup: {geo_us:.2f} us/check-in (naive loop: {naive_us:.2f} us)")
+    print(f"ip lookup:       {ip_us:.2f} us/check-in ({len(policy.allowlist)} merged ranges)")
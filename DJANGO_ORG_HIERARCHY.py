@@ -0,0 +1,423 @@
+# Organization hierarchy with materialized paths for org-scoped reports
+# Add the helpers to your app as org_tree.py and the views to views.py
+
+import threading
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from django.db import transaction
+from django.db.models import Count, Q, Sum, Value
+from django.db.models.functions import Concat, Substr
+from django.utils import timezone
+from .renderers import FastJSONRenderer
+from .cache_version import get_version, bump_version
+from .db_router import use_replica_reads
+
+PATH_SEPARATOR = "/"
+
+
+# Expected model changes (adjust names to match your project):
+"""
+class Organization(models.Model):
+    orgName = models.CharField(max_length=100)
+    parent = models.ForeignKey("self", null=True, blank=True, on_delete=models.SET_NULL, related_name="children")
+    # Materialized path of ids from the root, e.g. "/1/4/9/"
+    path = models.CharField(max_length=500, db_index=True, default="")
+
+class Employee(models.Model):
+    ...
+    organization = models.ForeignKey(Organization, null=True, blank=True, on_delete=models.SET_NULL)
+"""
+
+
+class OrgHierarchyNotIndexed(Exception):
+    """
+    An organization has no materialized path yet (empty path column);
+    run rebuild_paths() / manage.py rebuild_org_paths
+    """
+
+
+def build_path(parent_path, org_id):
+    return f"{parent_path or PATH_SEPARATOR}{org_id}{PATH_SEPARATOR}"
+
+
+def compute_paths(rows):
+    """
+    id -> path for (id, parent_id) rows, walking down from the roots so
+    every parent's path exists before its children's. Orgs whose parent
+    chain never reaches a root are left out.
+    """
+    children = {}
+    for org_id, parent_id in rows:
+        children.setdefault(parent_id, []).append(org_id)
+
+    paths = {}
+    stack = [(org_id, None) for org_id in children.get(None, ())]
+    while stack:
+        org_id, parent_path = stack.pop()
+        path = build_path(parent_path, org_id)
+        paths[org_id] = path
+        stack.extend((child_id, path) for child_id in children.get(org_id, ()))
+    return paths
+
+
+class OrgTree:
+    """
+    In-memory copy of the hierarchy: id -> path, parent and children
+    """
+
+    def __init__(self, rows):
+        # rows: iterable of (id, orgName, parent_id, path)
+        self.paths = {}
+        self.names = {}
+        self.parents = {}
+        self.children = {}
+        for org_id, name, parent_id, path in rows:
+            self.paths[org_id] = path
+            self.names[org_id] = name
+            self.parents[org_id] = parent_id
+            self.children.setdefault(parent_id, []).append(org_id)
+
+    def path_of(self, org_id):
+        return self.paths.get(org_id)
+
+    def subtree_ids(self, org_id):
+        """
+        The org and all of its descendants
+        """
+        if org_id not in self.paths:
+            return []
+        result = []
+        stack = [org_id]
+        while stack:
+            current = stack.pop()
+            result.append(current)
+            stack.extend(self.children.get(current, ()))
+        return result
+
+    def as_nested(self, root_id=None):
+        """
+        Nested dict representation for the tree endpoint
+        """
+        return [
+            {
+                "id": str(org_id),
+                "orgName": self.names.get(org_id),
+                "children": self.as_nested(org_id),
+            }
+            for org_id in self.children.get(root_id, ())
+        ]
+
+
+# Shared cache key holding the organization tree version
+TREE_VERSION_KEY = "org-tree-version"
+
+_tree = None
+_tree_version = None
+_tree_lock = threading.Lock()
+
+
+def get_org_tree():
+    """
+    Return this worker's tree, reloading it with one query when another
+    worker has bumped the shared version
+    """
+    global _tree, _tree_version
+    version = get_version(TREE_VERSION_KEY)
+    if _tree is None or _tree_version != version:
+        with _tree_lock:
+            if _tree is None or _tree_version != version:
+                # From the primary, never a lagging replica (see get_shift_catalog)
+                with use_replica_reads(False):
+                    _tree = OrgTree(Organization.objects.values_list("id", "orgName", "parent_id", "path"))
+                _tree_version = version
+    return _tree
+
+
+def invalidate_org_tree(*args, **kwargs):
+    """
+    Invalidate the tree in every worker; called after /organization/update/ and /organization/delete/
+    """
+    bump_version(TREE_VERSION_KEY)
+
+
+def rebuild_paths(batch_size=1000):
+    """
+    Recompute every organization's path from the parent links and write
+    the ones that changed. Fills the column for existing rows after the
+    path field is added, and repairs it if it ever drifts.
+    """
+    rows = list(Organization.objects.values_list("id", "parent_id", "path"))
+    paths = compute_paths((org_id, parent_id) for org_id, parent_id, _ in rows)
+    changed = [
+        Organization(pk=org_id, path=paths[org_id])
+        for org_id, _, path in rows
+        if org_id in paths and path != paths[org_id]
+    ]
+    with transaction.atomic():
+        Organization.objects.bulk_update(changed, ["path"], batch_size=batch_size)
+    invalidate_org_tree()
+    return len(changed)
+
+
+# Data migration to run after the migration that adds Organization.path:
+"""
+from django.db import migrations
+from yourapp.org_tree import compute_paths
+
+def fill_organization_paths(apps, schema_editor):
+    Organization = apps.get_model("yourapp", "Organization")
+    paths = compute_paths(Organization.objects.values_list("id", "parent_id"))
+    Organization.objects.bulk_update(
+        [Organization(pk=org_id, path=path) for org_id, path in paths.items()],
+        ["path"],
+        batch_size=1000,
+    )
+
+class Migration(migrations.Migration):
+    dependencies = [("yourapp", "XXXX_organization_path")]
+    operations = [migrations.RunPython(fill_organization_paths, migrations.RunPython.noop)]
+"""
+
+# Management command for repairs, save as management/commands/rebuild_org_paths.py
+"""
+from django.core.management.base import BaseCommand
+from ...org_tree import rebuild_paths
+
+class Command(BaseCommand):
+    help = "Recompute organization materialized paths from parent links"
+
+    def handle(self, *args, **options):
+        count = rebuild_paths()
+        self.stdout.write(self.style.SUCCESS(f"Updated {count} organization paths"))
+"""
+
+
+def set_parent(organization, parent):
+    """
+    Move an organization under a new parent (or to the root) and rewrite
+    the paths of its whole subtree in one UPDATE
+    """
+    if parent is not None:
+        if not parent.path:
+            raise OrgHierarchyNotIndexed(f"Organization {parent.pk} has no path")
+        if parent.pk == organization.pk or parent.path.startswith(organization.path or "\0"):
+            raise ValueError("An organization cannot be moved under itself or its descendants")
+
+    old_path = organization.path
+    new_path = build_path(parent.path if parent else None, organization.pk)
+
+    with transaction.atomic():
+        organization.parent = parent
+        organization.path = new_path
+        organization.save(update_fields=["parent", "path"])
+        if old_path and old_path != new_path:
+            Organization.objects.filter(path__startswith=old_path).exclude(pk=organization.pk).update(
+                path=Concat(Value(new_path), Substr("path", len(old_path) + 1))
+            )
+    invalidate_org_tree()
+
+
+def parent_in_path(path):
+    """
+    Parent id recorded in a path as a string ("/1/4/9/" -> "4"), None for a root
+    """
+    segments = path.strip(PATH_SEPARATOR).split(PATH_SEPARATOR)
+    return segments[-2] if len(segments) > 1 else None
+
+
+def ensure_path(organization):
+    """
+    Keep the stored path in line with parent_id after any save: fill it
+    for a new organization, and when the parent was changed directly
+    (e.g. by the update view's serializer) rewrite the subtree the same
+    way set_parent() does
+    """
+    parent_id = str(organization.parent_id) if organization.parent_id else None
+    if organization.path and parent_in_path(organization.path) == parent_id:
+        return
+
+    parent_path = None
+    if parent_id:
+        parent_path = Organization.objects.filter(pk=organization.parent_id).values_list(
+            "path", flat=True
+        ).first()
+        if not parent_path:
+            # Parent not indexed yet; recompute everything from the parent links
+            rebuild_paths()
+            return
+
+    old_path = organization.path
+    new_path = build_path(parent_path, organization.pk)
+    with transaction.atomic():
+        Organization.objects.filter(pk=organization.pk).update(path=new_path)
+        if old_path:
+            Organization.objects.filter(path__startswith=old_path).exclude(pk=organization.pk).update(
+                path=Concat(Value(new_path), Substr("path", len(old_path) + 1))
+            )
+    organization.path = new_path
+
+
+def on_organization_saving(sender, instance, **kwargs):
+    """
+    Reject a parent change that would create a cycle before it is saved;
+    connect to pre_save
+    """
+    if instance.pk and instance.parent_id and instance.path:
+        parent_path = Organization.objects.filter(pk=instance.parent_id).values_list("path", flat=True).first()
+        if parent_path and parent_path.startswith(instance.path):
+            raise ValueError("An organization cannot be moved under itself or its descendants")
+
+
+def on_organization_saved(sender, instance, **kwargs):
+    ensure_path(instance)
+    invalidate_org_tree()
+
+
+def on_organization_deleted(sender, instance, **kwargs):
+    if not instance.path:
+        # No prefix to find the former children by (an empty prefix would
+        # match every root), so recompute from the parent links instead
+        rebuild_paths()
+        return
+    # Children become roots (parent is SET_NULL), so their paths are rebuilt
+    for child in Organization.objects.filter(path__startswith=instance.path).exclude(pk=instance.pk).filter(
+        parent__isnull=True
+    ):
+        set_parent(child, None)
+    invalidate_org_tree()
+
+
+# Connect in your app (e.g. apps.py ready()). These fire for the
+# /organization/create/, /organization/update/ and /organization/delete/ views:
+"""
+from django.db.models.signals import pre_save, post_save, post_delete
+pre_save.connect(on_organization_saving, sender=Organization)
+post_save.connect(on_organization_saved, sender=Organization)
+post_delete.connect(on_organization_deleted, sender=Organization)
+"""
+
+# A parent changed by the update view (serializer save) is picked up by
+# on_organization_saved, which moves the subtree's paths with it.
+
+
+def subtree_filter(org_id, prefix="employee__organization__"):
+    """
+    Q object selecting rows under org_id's subtree with one indexed
+    prefix match on the path column, or None for an unknown org.
+    Raises OrgHierarchyNotIndexed for an empty path, which would
+    otherwise match every row.
+    """
+    path = get_org_tree().path_of(org_id)
+    if path is None:
+        return None
+    if not path:
+        raise OrgHierarchyNotIndexed(f"Organization {org_id} has no path")
+    return Q(**{f"{prefix}path__startswith": path})
+
+
+def _parse_org_id(pk):
+    try:
+        return int(pk)
+    except (TypeError, ValueError):
+        return pk
+
+
+class OrganizationTreeView(APIView):
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [FastJSONRenderer]
+
+    def get(self, request):
+        try:
+            return Response(get_org_tree().as_nested(), status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({
+                "error": f"Failed to get organization tree: {str(e)}"
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class OrganizationAttendanceSummaryView(APIView):
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [FastJSONRenderer]
+
+    def get(self, request, pk):
+        try:
+            org_id = _parse_org_id(pk)
+            scope = subtree_filter(org_id)
+            if scope is None:
+                return Response({
+                    "error": "Organization not found"
+                }, status=status.HTTP_404_NOT_FOUND)
+
+            current_month = timezone.now().month
+            current_year = timezone.now().year
+
+            totals = Attendance.objects.filter(
+                scope,
+                date__month=current_month,
+                date__year=current_year
+            ).aggregate(
+                presentDays=Count("id", filter=Q(check_in__isnull=False)),
+                absentDays=Count("id", filter=Q(status="absent")),
+                overtimeHours=Sum("overtime_hours"),
+                employees=Count("employee", distinct=True),
+            )
+
+            return Response({
+                "organizationId": str(org_id),
+                "organizationCount": len(get_org_tree().subtree_ids(org_id)),
+                "presentDays": totals["presentDays"],
+                "absentDays": totals["absentDays"],
+                "overtimeHours": round(totals["overtimeHours"] or 0, 2),
+                "employees": totals["employees"],
+                "month": current_month,
+                "year": current_year
+            }, status=status.HTTP_200_OK)
+
+        except OrgHierarchyNotIndexed:
+            return Response({
+                "error": "Organization hierarchy is not indexed, run rebuild_org_paths"
+            }, status=status.HTTP_409_CONFLICT)
+        except Exception as e:
+            return Response({
+                "error": f"Failed to get organization attendance summary: {str(e)}"
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class OrganizationLeaveSummaryView(APIView):
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [FastJSONRenderer]
+
+    def get(self, request, pk):
+        try:
+            org_id = _parse_org_id(pk)
+            scope = subtree_filter(org_id)
+            if scope is None:
+                return Response({
+                    "error": "Organization not found"
+                }, status=status.HTTP_404_NOT_FOUND)
+
+            current_year = timezone.now().year
+
+            # Assumes a Leave model with employee, status, start_date and days
+            totals = Leave.objects.filter(scope, start_date__year=current_year).aggregate(
+                usedLeaves=Sum("days", filter=Q(status="approved")),
+                pendingLeaves=Sum("days", filter=Q(status="pending")),
+            )
+
+            return Response({
+                "organizationId": str(org_id),
+                "usedLeaves": totals["usedLeaves"] or 0,
+                "pendingLeaves": totals["pendingLeaves"] or 0,
+                "year": current_year
+            }, status=status.HTTP_200_OK)
+
+        except OrgHierarchyNotIndexed:
+            return Response({
+                "error": "Organization hierarchy is not indexed, run rebuild_org_paths"
+            }, status=status.HTTP_409_CONFLICT)
+        except Exception as e:
+            return Response({
+                "error": f"Failed to get organization leave summary: {str(e)}"
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,363 @@
+# Shift and schedule engine
+# Add this file to your Django app as shift_engine.py. It replaces the
+# hardcoded 8 hour rule in CheckOutView with per-employee shifts.
+
+import threading
+from datetime import datetime, timedelta
+from django.utils import timezone
+from .cache_version import get_version, bump_version
+from .db_router import use_replica_reads
+
+# Used when an employee has no shift assigned for a day
+DEFAULT_STANDARD_HOURS = 8.0
+
+# How long after a night shift's scheduled end a check-out still belongs to it
+NIGHT_SHIFT_CHECKOUT_WINDOW = timedelta(hours=6)
+
+
+# Expected models (adjust names to match your project):
+"""
+class ShiftTemplate(models.Model):
+    name = models.CharField(max_length=50)
+    start_time = models.TimeField()
+    end_time = models.TimeField()          # earlier than start_time = ends next day
+    break_minutes = models.IntegerField(default=0)
+    grace_minutes = models.IntegerField(default=0)
+
+class ShiftRotation(models.Model):
+    name = models.CharField(max_length=50)
+    # Cycle of ShiftTemplate ids, null entries are days off, e.g. [1, 1, 1, 1, 1, null, null]
+    pattern = models.JSONField()
+
+class ShiftAssignment(models.Model):
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE)
+    template = models.ForeignKey(ShiftTemplate, null=True, blank=True, on_delete=models.CASCADE)
+    rotation = models.ForeignKey(ShiftRotation, null=True, blank=True, on_delete=models.CASCADE)
+    start_date = models.DateField()          # also day 0 of the rotation cycle
+    end_date = models.DateField(null=True, blank=True)
+
+# New fields on Attendance:
+    late_minutes = models.IntegerField(default=0)
+    early_leave_minutes = models.IntegerField(default=0)
+"""
+
+
+class ResolvedShift:
+    """
+    A shift template placed on a concrete day
+    """
+
+    def __init__(self, template_id, name, shift_date, start, end, break_minutes=0, grace_minutes=0):
+        self.template_id = template_id
+        self.name = name
+        self.shift_date = shift_date
+        self.start = start
+        self.end = end
+        self.break_minutes = break_minutes or 0
+        self.grace_minutes = grace_minutes or 0
+
+    @property
+    def standard_hours(self):
+        seconds = (self.end - self.start).total_seconds() - self.break_minutes * 60
+        return round(max(seconds, 0) / 3600, 2)
+
+    @property
+    def crosses_midnight(self):
+        return self.end.date() > self.shift_date
+
+
+def place_template(template, shift_date):
+    """
+    Turn a template dict into a ResolvedShift on shift_date
+    """
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(shift_date, template["start_time"]), tz)
+    end = timezone.make_aware(datetime.combine(shift_date, template["end_time"]), tz)
+    if end <= start:
+        end += timedelta(days=1)
+    return ResolvedShift(
+        template_id=template["id"],
+        name=template["name"],
+        shift_date=shift_date,
+        start=start,
+        end=end,
+        break_minutes=template["break_minutes"],
+        grace_minutes=template["grace_minutes"],
+    )
+
+
+# Shared cache key holding the template/rotation catalog version
+CATALOG_VERSION_KEY = "shift-catalog-version"
+
+_catalog = None
+_catalog_version = None
+_catalog_lock = threading.Lock()
+
+
+def get_shift_catalog():
+    """
+    (templates, rotations) dicts kept in memory per worker and reloaded
+    only when a template or rotation has changed in any worker
+    """
+    global _catalog, _catalog_version
+    version = get_version(CATALOG_VERSION_KEY)
+    if _catalog is None or _catalog_version != version:
+        with _catalog_lock:
+            if _catalog is None or _catalog_version != version:
+                # From the primary: a lagging replica would be cached under
+                # the new version until the next bump
+                with use_replica_reads(False):
+                    templates = {t["id"]: t for t in ShiftTemplate.objects.values(
+                        "id", "name", "start_time", "end_time", "break_minutes", "grace_minutes"
+                    )}
+                    rotations = {r["id"]: r["pattern"] or [] for r in ShiftRotation.objects.values("id", "pattern")}
+                _catalog = (templates, rotations)
+                _catalog_version = version
+    return _catalog
+
+
+def invalidate_shift_catalog(*args, **kwargs):
+    """
+    Connect to ShiftTemplate / ShiftRotation post_save and post_delete
+    """
+    bump_version(CATALOG_VERSION_KEY)
+
+
+# Connect in your app (e.g. apps.py ready()):
+"""
+from django.db.models.signals import post_save, post_delete
+for model in (ShiftTemplate, ShiftRotation):
+    post_save.connect(invalidate_shift_catalog, sender=model)
+    post_delete.connect(invalidate_shift_catalog, sender=model)
+"""
+
+
+class ScheduleCache:
+    """
+    Precomputed (employee_id, date) -> ResolvedShift map for a date range.
+    Templates and rotations come from the in-memory catalog, so building
+    one costs a single assignments query and resolving a shift afterwards
+    is a dict lookup.
+    """
+
+    def __init__(self, start_date, end_date, employee_ids=None):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.shifts = {}
+
+        templates, rotations = get_shift_catalog()
+
+        assignments = ShiftAssignment.objects.filter(start_date__lte=end_date).exclude(
+            end_date__lt=start_date
+        )
+        if employee_ids is not None:
+            assignments = assignments.filter(employee_id__in=employee_ids)
+
+        # Later assignments override earlier ones for overlapping days
+        for assignment in assignments.order_by("start_date").values(
+            "employee_id", "template_id", "rotation_id", "start_date", "end_date"
+        ):
+            first_day = max(assignment["start_date"], start_date)
+            last_day = min(assignment["end_date"] or end_date, end_date)
+            pattern = rotations.get(assignment["rotation_id"]) if assignment["rotation_id"] else None
+
+            day = first_day
+            while day <= last_day:
+                if pattern:
+                    cycle_index = (day - assignment["start_date"]).days % len(pattern)
+                    template_id = pattern[cycle_index]
+                else:
+                    template_id = assignment["template_id"]
+
+                key = (assignment["employee_id"], day)
+                template = templates.get(template_id)
+                if template:
+                    self.shifts[key] = place_template(template, day)
+                else:
+                    # Day off in the rotation
+                    self.shifts.pop(key, None)
+                day += timedelta(days=1)
+
+    def get(self, employee_id, shift_date):
+        return self.shifts.get((employee_id, shift_date))
+
+    @classmethod
+    def for_employee(cls, employee_id, now):
+        """
+        Yesterday and today (local dates) for one employee; build once per
+        request and pass it to the helpers below
+        """
+        today = timezone.localtime(now).date()
+        return cls(today - timedelta(days=1), today, employee_ids=[employee_id])
+
+
+def resolve_shift_date(employee_id, now, schedule):
+    """
+    Attendance date a check-in at `now` belongs to. A night shift that
+    started yesterday still owns check-ins until its end.
+    """
+    today = timezone.localtime(now).date()
+    yesterday = today - timedelta(days=1)
+    previous = schedule.get(employee_id, yesterday)
+    if previous and previous.crosses_midnight and now < previous.end:
+        return yesterday
+    return today
+
+
+def night_shift_still_open(schedule, employee_id, shift_date, now):
+    """
+    Whether a record from shift_date (yesterday) can still be checked out
+    at `now`: its shift must end after midnight and not longer ago than
+    NIGHT_SHIFT_CHECKOUT_WINDOW
+    """
+    shift = schedule.get(employee_id, shift_date)
+    return bool(shift and shift.crosses_midnight and now <= shift.end + NIGHT_SHIFT_CHECKOUT_WINDOW)
+
+
+def find_open_attendance(employee, now, schedule):
+    """
+    Latest checked-in but not checked-out record from today or yesterday,
+    so night shifts that cross midnight can still check out.
+    """
+    today = timezone.localtime(now).date()
+    attendance = Attendance.objects.filter(
+        employee=employee,
+        date__in=[today, today - timedelta(days=1)],
+        check_in__isnull=False,
+        check_out__isnull=True,
+    ).order_by("-date").first()
+    if attendance and attendance.date != today:
+        if not night_shift_still_open(schedule, employee.id, attendance.date, now):
+            return None
+    return attendance
+
+
+def current_attendance(employee, now, schedule):
+    """
+    (attendance or None, shift_date) to show as the employee's current day:
+    an open night shift from yesterday first, otherwise the record for the
+    local shift date. Used by the status and dashboard views.
+    """
+    attendance = find_open_attendance(employee, now, schedule)
+    if attendance:
+        return attendance, attendance.date
+    shift_date = resolve_shift_date(employee.id, now, schedule)
+    return Attendance.objects.filter(employee=employee, date=shift_date).first(), shift_date
+
+
+def compute_shift_metrics(shift, check_in, check_out):
+    """
+    Returns dict with work_hours, late_minutes, early_leave_minutes,
+    overtime_hours and is_overtime for one attendance record.
+    With a shift, work_hours excludes its break.
+    """
+    work_hours = round((check_out - check_in).total_seconds() / 3600, 2) if check_in and check_out else 0.0
+
+    if shift is None:
+        overtime = round(work_hours - DEFAULT_STANDARD_HOURS, 2) if work_hours > DEFAULT_STANDARD_HOURS else 0.0
+        return {
+            "work_hours": work_hours,
+            "late_minutes": 0,
+            "early_leave_minutes": 0,
+            "overtime_hours": overtime,
+            "is_overtime": overtime > 0,
+        }
+
+    # Unpaid break comes off the time worked, never below zero
+    if work_hours:
+        work_hours = round(max(work_hours - shift.break_minutes / 60, 0.0), 2)
+
+    late_minutes = 0
+    if check_in:
+        late_seconds = (check_in - shift.start).total_seconds() - shift.grace_minutes * 60
+        late_minutes = int(late_seconds // 60) if late_seconds > 0 else 0
+
+    early_leave_minutes = 0
+    if check_out:
+        early_seconds = (shift.end - check_out).total_seconds()
+        early_leave_minutes = int(early_seconds // 60) if early_seconds > 0 else 0
+
+    # Overtime is time worked beyond the shift's standard hours, so staying
+    # late only makes up for arriving late
+    overtime = 0.0
+    if work_hours > shift.standard_hours:
+        overtime = round(work_hours - shift.standard_hours, 2)
+
+    return {
+        "work_hours": work_hours,
+        "late_minutes": late_minutes,
+        "early_leave_minutes": early_leave_minutes,
+        "overtime_hours": overtime,
+        "is_overtime": overtime > 0,
+    }
+
+
+def apply_shift_metrics(attendance, metrics):
+    attendance.total_work_hours = metrics["work_hours"]
+    attendance.late_minutes = metrics["late_minutes"]
+    attendance.early_leave_minutes = metrics["early_leave_minutes"]
+    attendance.overtime_hours = metrics["overtime_hours"]
+    attendance.is_overtime = metrics["is_overtime"]
+
+
+# Days of schedule held in memory at once by recompute_attendance_metrics
+RECOMPUTE_CHUNK_DAYS = 31
+
+
+def recompute_attendance_metrics(start_date, end_date, batch_size=1000, chunk_days=RECOMPUTE_CHUNK_DAYS):
+    """
+    Recompute lateness / early leave / overtime for every record in the
+    range. Walks the range in chunk_days windows with one schedule cache
+    per window, so memory stays bounded for long ranges; updates in bulk.
+    """
+    count = 0
+    chunk_start = start_date
+    while chunk_start <= end_date:
+        chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), end_date)
+        cache = ScheduleCache(chunk_start, chunk_end)
+        records = Attendance.objects.filter(
+            date__gte=chunk_start, date__lte=chunk_end, check_in__isnull=False
+        ).only("id", "employee_id", "date", "check_in", "check_out")
+
+        updated = []
+        for attendance in records.iterator(chunk_size=batch_size):
+            shift = cache.get(attendance.employee_id, attendance.date)
+            apply_shift_metrics(attendance, compute_shift_metrics(shift, attendance.check_in, attendance.check_out))
+            updated.append(attendance)
+            if len(updated) >= batch_size:
+                count += _flush_metrics(updated)
+                updated = []
+        if updated:
+            count += _flush_metrics(updated)
+
+        # Drop this window's schedule before building the next one
+        del cache
+        chunk_start = chunk_end + timedelta(days=1)
+    return count
+
+
+def _flush_metrics(records):
+    Attendance.objects.bulk_update(records, [
+        "total_work_hours", "late_minutes", "early_leave_minutes", "overtime_hours", "is_overtime"
+    ])
+    return len(records)
+
+
+# Management command for bulk recomputation
+# Save as management/commands/recompute_shift_metrics.py
+"""
+from datetime import date
+from django.core.management.base import BaseCommand
+from ...shift_engine import recompute_attendance_metrics
+
+class Command(BaseCommand):
+    help = "Recompute lateness, early leave and overtime from shift schedules"
+
+    def add_arguments(self, parser):
+        parser.add_argument("start", type=date.fromisoformat)
+        parser.add_argument("end", type=date.fromisoformat)
+
+    def handle(self, *args, **options):
+        count = recompute_attendance_metrics(options["start"], options["end"])
+        self.stdout.write(self.style.SUCCESS(f"Recomputed {count} attendance records"))
+"""
@@ -5,7 +5,10 @@ urlpatterns = [
     # Existing attendance paths
     path("checkin/", CheckInView.as_view(), name="checkin"),
     path("checkout/", CheckOutView.as_view(), name="checkout"),
+    path("attendance-sync/", AttendanceSyncView.as_view(), name="attendance-sync"),
     path("Attendance/overall/", OverallAttendanceListView.as_view()),
+    # Date-bounded fast list, before Attendance/<str:pk>/ so it isn't taken as a pk
+    path("Attendance/range/", AttendanceRangeListView.as_view(), name="attendance-range"),
     path("Attendance/allmark/", EmpMarkAllView.as_view(), name="AttendanceMarkAll"),
     path("Attendance/<str:pk>/", EmpAttendanceListView.as_view(), name="EmpAttendance"),
     path("Attendance/mark/<str:pk>/", EmpAttendanceMarkView.as_view(), name="AttendanceMark"),
@@ -16,4 +19,9 @@ urlpatterns = [
     path("attendance-status/", AttendanceStatusView.as_view(), name="attendance-status"),
     path("recent-activities/", RecentActivitiesView.as_view(), name="recent-activities"),
     path("dashboard/", DashboardDataView.as_view(), name="dashboard-data"),
+    
+    # Organization hierarchy and subtree-scoped reports
+    path("organization/tree/", OrganizationTreeView.as_view(), name="organization-tree"),
+    path("organization/<str:pk>/attendance-summary/", OrganizationAttendanceSummaryView.as_view(), name="organization-attendance-summary"),
+    path("organization/<str:pk>/leave-summary/", OrganizationLeaveSummaryView.as_view(), name="organization-leave-summary"),
 ]
\ No newline at end of file
@@ -8,9 +8,11 @@ from django.utils import timezone
 from datetime import datetime, timedelta
 from django.db.models import Count, Q
 from calendar import monthrange
+from .db_router import ReplicaReadMixin
+from .shift_engine import ScheduleCache, current_attendance
 
 # ========== Leave Balance View ==========
-class LeaveBalanceView(APIView):
+class LeaveBalanceView(ReplicaReadMixin, APIView):
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
@@ -53,7 +55,7 @@ class LeaveBalanceView(APIView):
 
 
 # ========== Attendance Summary View ==========
-class AttendanceSummaryView(APIView):
+class AttendanceSummaryView(ReplicaReadMixin, APIView):
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
@@ -106,16 +108,17 @@ class AttendanceSummaryView(APIView):
 
 
 # ========== Attendance Status View (Today's Status) ==========
-class AttendanceStatusView(APIView):
+class AttendanceStatusView(ReplicaReadMixin, APIView):
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
         try:
             employee = Employee.objects.get(id=request.user.id)
-            today = timezone.now().date()
+            now = timezone.now()
             
-            # Get today's attendance record
-            attendance = Attendance.objects.filter(employee=employee, date=today).first()
+            # Get the current day's record (local shift date, or yesterday's open night shift)
+            schedule = ScheduleCache.for_employee(employee.id, now)
+            attendance, today = current_attendance(employee, now, schedule)
             
             if not attendance:
                 return Response({
@@ -155,7 +158,7 @@ class AttendanceStatusView(APIView):
 
 
 # ========== Recent Activities View ==========
-class RecentActivitiesView(APIView):
+class RecentActivitiesView(ReplicaReadMixin, APIView):
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
@@ -214,7 +217,7 @@ class RecentActivitiesView(APIView):
 
 
 # ========== Dashboard Data View (All data in one call) ==========
-class DashboardDataView(APIView):
+class DashboardDataView(ReplicaReadMixin, APIView):
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
@@ -222,9 +225,10 @@ class DashboardDataView(APIView):
             employee = Employee.objects.get(id=request.user.id)
             
             # Get all dashboard data in one call
-            current_month = timezone.now().month
-            current_year = timezone.now().year
-            today = timezone.now().date()
+            now = timezone.now()
+            local_today = timezone.localtime(now).date()
+            current_month = local_today.month
+            current_year = local_today.year
             
             # Attendance summary
             attendance_records = Attendance.objects.filter(
@@ -237,11 +241,9 @@ class DashboardDataView(APIView):
                 check_in__isnull=False
             ).count()
             
-            # Today's attendance
-            today_attendance = Attendance.objects.filter(
-                employee=employee, 
-                date=today
-            ).first()
+            # Today's attendance (an open night shift from yesterday takes precedence)
+            schedule = ScheduleCache.for_employee(employee.id, now)
+            today_attendance, _ = current_attendance(employee, now, schedule)
             
             # Leave balance
             total_leaves = 24
@@ -407,11 +407,19 @@ class ApiService {
   }
 
   // ========== Check-In ==========
-  Future<bool> checkIn() async {
+  // latitude/longitude are validated against the office geofences
+  Future<bool> checkIn({double? latitude, double? longitude}) async {
     try {
       final url = Uri.parse("${baseUrl}api/employee/checkin/");
       final headers = await getHeaders();
-      final response = await http.post(url, headers: headers);
+      final response = await http.post(
+        url,
+        headers: headers,
+        body: json.encode({
+          if (latitude != null) "latitude": latitude,
+          if (longitude != null) "longitude": longitude,
+        }),
+      );
 
       print("CheckIn Response: ${response.body}");
 
@@ -438,6 +446,31 @@ class ApiService {
     }
   }
 
+  // ========== Sync Offline Attendance ==========
+  // events: [{"idempotency_key", "type": "check_in"|"check_out", "timestamp",
+  //           "device", "latitude", "longitude"}]
+  Future<Map<String, dynamic>?> syncAttendance(List<Map<String, dynamic>> events) async {
+    try {
+      final url = Uri.parse("${baseUrl}api/employee/attendance-sync/");
+      final headers = await getHeaders();
+      final response = await http.post(
+        url,
+        headers: headers,
+        body: json.encode({"events": events}),
+      );
+
+      print("Attendance Sync Response: ${response.body}");
+
+      if (response.statusCode == 200) {
+        return json.decode(response.body);
+      }
+      return null;
+    } catch (e) {
+      print("Attendance Sync Error: $e");
+      return null;
+    }
+  }
+
   // ========== Employee Login ==========
   Future<Map<String, dynamic>?> loginEmployee(String email, String password) async {
     try {